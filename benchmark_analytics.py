@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Benchmark: NumPy column analytics vs. pure-Python dictionaries
+
+analyze_files keeps scan results as NumPy columns and computes its report
+with vectorized operations. This script compares that with the per-entry
+dictionary approach the listing tools use.
+
+The default run compares only the summary step on 1,000,000 synthetic
+entries. --tree and --generate compare the whole tool end to end - walking
+the tree plus summarizing - on a real or freshly generated tree.
+
+Usage:
+    python benchmark_analytics.py [entries]
+    python benchmark_analytics.py --tree DIRECTORY
+    python benchmark_analytics.py --generate FILES
+"""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from simple_mcp_server import _scan_tree_columns, _summarize_columns
+
+EXTENSIONS = ['.py', '.pyc', '.txt', '.md', '.json', '.so', '.o', '.log', '.png', '']
+
+def make_entries(count, now):
+    """Build synthetic file entries as a list of dicts (like the listing tools do)."""
+    random.seed(0)
+    return [
+        {
+            'name': f"file{i}{random.choice(EXTENSIONS)}",
+            'size': int(random.lognormvariate(8, 2.5)),
+            'modified': now - random.uniform(0, 3 * 365 * 86400),
+            'depth': random.randint(0, 12),
+        }
+        for i in range(count)
+    ]
+
+def build_tree(root, count, files_per_directory=1000):
+    """Create count empty files, spread over nested directories, with varied sizes and ages."""
+    random.seed(0)
+    now = time.time()
+    directory = root
+    for i in range(count):
+        if i % files_per_directory == 0:
+            # Three levels deep, e.g. root/d3/d17/d123
+            n = i // files_per_directory
+            directory = os.path.join(root, f"d{n // 10000}", f"d{n // 100}", f"d{n}")
+            os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"file{i}{random.choice(EXTENSIONS)}")
+        with open(path, "wb") as handle:
+            handle.truncate(int(random.lognormvariate(8, 2.5)))  # Sparse - size without disk use
+        modified = now - random.uniform(0, 3 * 365 * 86400)
+        os.utime(path, (modified, modified))
+
+def scan_tree_dicts(root):
+    """Walk a tree like _scan_tree_columns, but build one dict per file."""
+    entries = []
+    stack = [(root, 0)]
+    while stack:
+        directory, depth = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.name.startswith('.'):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append((entry.path, depth + 1))
+                            continue
+                        if not entry.is_file(follow_symlinks=False):
+                            continue
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    entries.append({
+                        'name': entry.name,
+                        'size': st.st_size,
+                        'modified': st.st_mtime,
+                        'depth': depth,
+                    })
+        except OSError:
+            continue
+    return entries
+
+def compare_end_to_end(root, now):
+    """Time walk + summary for the dict approach and the NumPy column approach."""
+    for label, options in [("full report", {}), ("older than 365 days, >= 4 KiB", {'older_than_days': 365, 'min_size': 4096})]:
+        print(f"\n=== {label} ===")
+        entries, dict_scan = timed("scan tree into dicts", lambda: scan_tree_dicts(root))
+        python_summary, python_time = timed("pure Python summary", lambda: summarize_python(entries, now, **options))
+        del entries
+        columns, column_scan = timed("scan tree into columns (_scan_tree_columns)", lambda: _scan_tree_columns(root))
+        numpy_summary, numpy_time = timed("NumPy summary", lambda: _summarize_columns(*columns[:5], now=now, **options))
+
+        assert python_summary['count'] == numpy_summary['count']
+        assert python_summary['total_size'] == numpy_summary['total_size']
+        python_total = dict_scan + python_time
+        numpy_total = column_scan + numpy_time
+        print(f"  {'total: dicts + Python':<44} {python_total * 1000:>10.1f} ms")
+        print(f"  {'total: columns + NumPy':<44} {numpy_total * 1000:>10.1f} ms")
+        print(f"  🎯 End to end the NumPy path is {python_total / numpy_total:.2f}x faster"
+              f" (summary step alone: {python_time / numpy_time:.1f}x)")
+
+def entries_to_columns(entries):
+    """Convert dict entries to the column layout used by analyze_files."""
+    extension_lookup = {}
+    extension_ids = []
+    for entry in entries:
+        extension = os.path.splitext(entry['name'])[1].lower()
+        extension_ids.append(extension_lookup.setdefault(extension, len(extension_lookup)))
+    return (
+        np.fromiter((e['size'] for e in entries), dtype=np.int64, count=len(entries)),
+        np.fromiter((e['modified'] for e in entries), dtype=np.float64, count=len(entries)),
+        np.fromiter((e['depth'] for e in entries), dtype=np.int32, count=len(entries)),
+        np.array(extension_ids, dtype=np.int32),
+        list(extension_lookup),
+    )
+
+def summarize_python(entries, now, older_than_days=None, min_size=0, top=10):
+    """The same report as _summarize_columns, one dict at a time."""
+    cutoff = None if older_than_days is None else now - older_than_days * 86400
+    selected = [
+        e for e in entries
+        if e['size'] >= min_size and (cutoff is None or e['modified'] < cutoff)
+    ]
+    summary = {'count': len(selected), 'total_size': sum(e['size'] for e in selected)}
+    if not selected:
+        return summary
+
+    ordered = sorted(e['size'] for e in selected)
+    def percentile(q):
+        # Linear interpolation, matching np.percentile's default
+        position = (len(ordered) - 1) * q / 100
+        low = int(position)
+        high = min(low + 1, len(ordered) - 1)
+        return int(ordered[low] + (ordered[high] - ordered[low]) * (position - low))
+    summary['size_percentiles'] = {
+        'p50': percentile(50), 'p90': percentile(90), 'p99': percentile(99), 'max': ordered[-1],
+    }
+
+    by_extension = {}
+    size_buckets = {}
+    depth_counts = {}
+    age_edges = [0, 1, 7, 30, 90, 365]
+    age_counts = [0] * len(age_edges)
+    for e in selected:
+        extension = os.path.splitext(e['name'])[1].lower() or '(none)'
+        count, total = by_extension.get(extension, (0, 0))
+        by_extension[extension] = (count + 1, total + e['size'])
+
+        bucket = e['size'].bit_length()
+        size_buckets[bucket] = size_buckets.get(bucket, 0) + 1
+
+        depth_counts[e['depth']] = depth_counts.get(e['depth'], 0) + 1
+
+        age = max((now - e['modified']) / 86400, 0)
+        for i in range(len(age_edges) - 1, -1, -1):
+            if age >= age_edges[i]:
+                age_counts[i] += 1
+                break
+
+    summary['by_extension'] = sorted(
+        ((ext, count, total) for ext, (count, total) in by_extension.items()),
+        key=lambda item: item[2], reverse=True)[:top]
+    summary['size_histogram'] = sorted(size_buckets.items())
+    summary['age_histogram'] = age_counts
+    summary['depth_counts'] = sorted(depth_counts.items())
+    return summary
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<44} {elapsed * 1000:>10.1f} ms")
+    return result, elapsed
+
+def main():
+    now = time.time()
+
+    if len(sys.argv) > 2 and sys.argv[1] == '--tree':
+        print(f"📁 Benchmarking on {sys.argv[2]}")
+        compare_end_to_end(sys.argv[2], now)
+        return
+
+    if len(sys.argv) > 2 and sys.argv[1] == '--generate':
+        count = int(sys.argv[2])
+        root = tempfile.mkdtemp(prefix="analytics_bench_")
+        try:
+            print(f"📁 Generating {count:,} files in {root}")
+            timed("generate tree", lambda: build_tree(root, count))
+            compare_end_to_end(root, now)
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+        return
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"📊 Building {count:,} synthetic entries")
+    entries = make_entries(count, now)
+
+    for label, options in [("full report", {}), ("older than 365 days, >= 4 KiB", {'older_than_days': 365, 'min_size': 4096})]:
+        print(f"\n=== {label} ===")
+        python_summary, python_time = timed("pure Python over dicts", lambda: summarize_python(entries, now, **options))
+        columns, convert_time = timed("convert dicts to NumPy columns", lambda: entries_to_columns(entries))
+        numpy_summary, numpy_time = timed("NumPy summary", lambda: _summarize_columns(*columns, now=now, **options))
+
+        assert python_summary['count'] == numpy_summary['count']
+        assert python_summary['total_size'] == numpy_summary['total_size']
+        print(f"  🎯 NumPy summary step is {python_time / numpy_time:.1f}x faster"
+              f" ({python_time / (convert_time + numpy_time):.1f}x including conversion)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark: stat_paths vs. listing parent directories
+
+Agents that only need a few hundred specific files used to list every parent
+directory to find them. This script builds a temporary tree, picks random
+paths from it, and times both approaches using the real server tools.
+"""
+
+import asyncio
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from simple_mcp_server import list_files_mcp_ready, stat_paths
+
+def build_tree(root, directories, files_per_directory):
+    """Create a tree of small files and return the list of file paths."""
+    paths = []
+    for d in range(directories):
+        directory = os.path.join(root, f"dir{d:04d}")
+        os.makedirs(directory)
+        for f in range(files_per_directory):
+            path = os.path.join(directory, f"file{f:05d}.txt")
+            with open(path, "w") as handle:
+                handle.write("x" * (f % 100))
+            paths.append(path)
+    return paths
+
+async def time_it(label, coroutine_factory, repeat=5):
+    """Run a coroutine several times and print the best time."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await coroutine_factory()
+        best = min(best, time.perf_counter() - start)
+    print(f"  {label:<40} {best * 1000:>10.2f} ms")
+    return best
+
+async def main():
+    directories = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    files_per_directory = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    wanted = int(sys.argv[3]) if len(sys.argv) > 3 else 2000
+
+    root = tempfile.mkdtemp(prefix="stat_paths_bench_")
+    try:
+        print(f"📁 Building {directories} directories x {files_per_directory} files in {root}")
+        all_paths = build_tree(root, directories, files_per_directory)
+
+        random.seed(0)
+        sample = random.sample(all_paths, min(wanted, len(all_paths)))
+        sample += [os.path.join(root, "missing", "file.txt")] * 10  # Include some misses
+        parents = sorted({os.path.dirname(p) for p in sample})
+
+        print(f"🔍 Looking up {len(sample)} paths across {len(parents)} directories\n")
+
+        async def list_parents():
+            for parent in parents:
+                await list_files_mcp_ready(parent)
+
+        async def sequential_stat():
+            for path in sample:
+                try:
+                    os.stat(path)
+                except OSError:
+                    pass
+
+        listing = await time_it("list_files_mcp_ready per parent", list_parents)
+        baseline = await time_it("os.stat one path at a time", sequential_stat)
+        batched = await time_it("stat_paths", lambda: stat_paths(sample))
+
+        print(f"\n🎯 stat_paths is {listing / batched:.1f}x faster than listing parents")
+        print(f"   and {batched / baseline:.1f}x slower than a bare os.stat loop (grouping, formatting, JSON)")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -2,7 +2,8 @@
 """
 Simple MCP Server - Educational Example
 
-This is a minimal Model Context Protocol server that provides one tool.
+This is a small Model Context Protocol server: it starts with a single greet
+tool and grows file system tools (listing, watching, stat and analysis) on top.
 Students can see how MCP servers work without complex implementation details.
 
 Built following the official MCP documentation patterns (2025).
@@ -12,10 +13,88 @@ from mcp.server.fastmcp import FastMCP
 from pathlib import Path
 import os # Add this line for basic file operations
 import datetime
+import asyncio
+import cProfile
+import fnmatch
+import stat as stat_module
+import functools
+import io
+import json
+import pstats
+import sys
+import time
+import tracemalloc
+
+# NumPy is only needed by the analyze_files tool - the rest of the server works without it
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# watchdog is optional - with it, wait_for_changes gets change events from the
+# operating system instead of scanning the watched directories
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
 
 # Create the MCP server using FastMCP (official 2025 pattern)
 mcp = FastMCP("hello-server")
 
+# Profiling is off by default - set MCP_ENABLE_PROFILING=1 to expose the profile tool
+PROFILING_ENABLED = os.environ.get("MCP_ENABLE_PROFILING", "") == "1"
+PROFILE_OUTPUT_DIR = os.environ.get("MCP_PROFILE_DIR", "profiles")
+
+# The capture currently running (only one at a time), or None
+_profile_capture = None
+
+
+def profiled(func):
+    """
+    Count calls to a tool so a running profile capture can stop after N calls.
+    
+    In tracemalloc mode this also snapshots memory just as the tool returns,
+    while its per-entry dicts and strings are still alive - after the call
+    they are freed and no longer show up.
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        capture = _profile_capture
+        previous_hook = None
+        if capture is not None and capture['mode'] == 'tracemalloc':
+            def snapshot_on_return(frame, event, arg):
+                if event == 'return' and frame.f_code is func.__code__:
+                    traced = tracemalloc.get_traced_memory()[0]
+                    if traced > capture['snapshot_bytes']:
+                        capture['snapshot'] = tracemalloc.take_snapshot()
+                        capture['snapshot_bytes'] = traced
+            previous_hook = sys.getprofile()
+            sys.setprofile(snapshot_on_return)
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            if capture is not None and capture['mode'] == 'tracemalloc':
+                sys.setprofile(previous_hook)
+            if capture is not None:
+                capture['calls'] += 1
+                if 0 < capture['max_calls'] <= capture['calls']:
+                    capture['done'].set()
+    return wrapper
+
+# The event loop's own code - hidden from profile reports so idle waiting doesn't fill them
+_ASYNCIO_DIR = os.path.dirname(asyncio.__file__)
+_SELECTORS_FILE = os.path.join(os.path.dirname(os.__file__), 'selectors.py')
+
+def _is_event_loop_frame(key):
+    """True for a pstats entry that belongs to asyncio or its idle polling."""
+    filename, _, function = key
+    if filename == '~':
+        # Built-ins: the selector's wait and the context wrapper around every callback
+        return any(name in function for name in ('select', 'poll', '_contextvars.Context'))
+    return filename.startswith(_ASYNCIO_DIR) or filename == _SELECTORS_FILE
+
 @mcp.tool()
 async def greet(name: str) -> str:
     """Say hello to someone.
@@ -29,6 +108,7 @@ async def greet(name: str) -> str:
     return f"Hello, {name}! Welcome to MCP!"
 
 @mcp.tool()
+@profiled
 async def list_files_basic(directory_path: str) -> str:
     """
     List files in a directory (basic version).
@@ -53,6 +133,7 @@ async def list_files_basic(directory_path: str) -> str:
         return f"❌ Permission denied: {directory_path}"
     
 @mcp.tool()
+@profiled
 async def list_files_detailed(directory_path, include_hidden=False):
     """
     Detailed file listing using pathlib (modern approach)
@@ -122,6 +203,7 @@ async def list_files_detailed(directory_path, include_hidden=False):
         return error_msg
 
 @mcp.tool()
+@profiled
 async def list_files_mcp_ready(directory_path: str, include_hidden: bool = False) -> str:
     """
     File listing formatted for MCP server return value
@@ -178,6 +260,818 @@ async def list_files_mcp_ready(directory_path: str, include_hidden: bool = False
     except Exception as e:
         return f"❌ Error listing directory: {e}"
 
+@mcp.tool()
+async def profile(mode: str = "cprofile", seconds: float = 10.0, calls: int = 0, top: int = 20) -> str:
+    """
+    Profile the running server for a while and report where the time/memory goes
+    
+    Only available when the server is started with MCP_ENABLE_PROFILING=1.
+    While the capture runs, call the other tools as usual - their work is recorded.
+    
+    Args:
+        mode: "cprofile" (top functions by cumulative time) or "tracemalloc" (top allocation sites)
+        seconds: How long to capture for (also the upper limit when calls is set)
+        calls: Stop after this many listing tool calls (0 = only use seconds)
+        top: How many functions / allocation sites to report
+        
+    Returns:
+        Summary of the top entries, plus the paths of the files written for offline comparison
+    """
+    global _profile_capture
+    
+    if not PROFILING_ENABLED:
+        return "❌ Profiling is disabled. Restart the server with MCP_ENABLE_PROFILING=1"
+    
+    if mode not in ("cprofile", "tracemalloc"):
+        return f"❌ Unknown profile mode: {mode} (use 'cprofile' or 'tracemalloc')"
+    
+    if _profile_capture is not None:
+        return "❌ A profile capture is already running"
+    
+    if seconds <= 0:
+        return f"❌ seconds must be positive: {seconds}"
+    
+    try:
+        output_dir = Path(PROFILE_OUTPUT_DIR)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+        
+        # Tools run on the event loop thread, so enabling the profiler here
+        # records every tool call served until we disable it again
+        profiler = None
+        started_tracemalloc = False
+        baseline = None
+        if mode == "cprofile":
+            profiler = cProfile.Profile()
+            profiler.enable()
+        else:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracemalloc = True
+            baseline = tracemalloc.take_snapshot()
+        
+        _profile_capture = {
+            'mode': mode,
+            'max_calls': max(calls, 0),
+            'calls': 0,
+            'done': asyncio.Event(),
+            'snapshot': None,         # Snapshot taken inside the heaviest listing call
+            'snapshot_bytes': 0,
+        }
+        started = time.perf_counter()
+        
+        try:
+            await asyncio.wait_for(_profile_capture['done'].wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            else:
+                snapshot = _profile_capture['snapshot']
+                taken_in_call = snapshot is not None
+                if not taken_in_call:
+                    snapshot = tracemalloc.take_snapshot()
+                current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+                if started_tracemalloc:
+                    tracemalloc.stop()
+        
+        elapsed = time.perf_counter() - started
+        calls_seen = _profile_capture['calls']
+        
+        result = f"Profile ({mode}) captured for {elapsed:.2f}s, {calls_seen} listing calls\n\n"
+        
+        if profiler is not None:
+            stats_file = output_dir / f"profile-{stamp}.prof"
+            text_file = output_dir / f"profile-{stamp}.txt"
+            profiler.dump_stats(stats_file)
+            
+            # Drop the event loop's own frames (_run_once, select, poll...) -
+            # otherwise idle waiting fills the top of the list
+            report = io.StringIO()
+            stats = pstats.Stats(profiler, stream=report)
+            for key in [key for key in stats.stats if _is_event_loop_frame(key)]:
+                del stats.stats[key]
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+            text_file.write_text(report.getvalue(), encoding='utf-8')
+            
+            result += report.getvalue().strip() + "\n\n"
+            result += f"Saved: {stats_file} (open with pstats or snakeviz)\n"
+            result += f"Saved: {text_file}\n"
+        else:
+            snapshot_file = output_dir / f"tracemalloc-{stamp}.snapshot"
+            text_file = output_dir / f"tracemalloc-{stamp}.txt"
+            ignored = (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            )
+            snapshot = snapshot.filter_traces(ignored)
+            snapshot.dump(str(snapshot_file))
+            
+            lines = [f"Traced memory: {current_bytes:,} bytes now, {peak_bytes:,} bytes peak"]
+            if taken_in_call:
+                lines.append("Snapshot taken as the heaviest listing call returned.")
+            else:
+                lines.append("No listing calls ran - snapshot taken at the end of the capture.")
+            lines.append("Only allocations still held at snapshot time are shown, minus those present before the capture.")
+            lines.append("")
+            lines.append(f"{'Size':>12} {'Count':>8}  Location")
+            differences = snapshot.compare_to(baseline.filter_traces(ignored), 'lineno')
+            for stat in [d for d in differences if d.size_diff > 0][:top]:
+                frame = stat.traceback[0]
+                lines.append(f"{stat.size_diff:>12,} {stat.count_diff:>8,}  {frame.filename}:{frame.lineno}")
+            report = "\n".join(lines)
+            text_file.write_text(report + "\n", encoding='utf-8')
+            
+            result += report + "\n\n"
+            result += f"Saved: {snapshot_file} (load with tracemalloc.Snapshot.load)\n"
+            result += f"Saved: {text_file}\n"
+        
+        return result
+        
+    except PermissionError:
+        return f"❌ Permission denied writing profile output: {PROFILE_OUTPUT_DIR}"
+        
+    except Exception as e:
+        return f"❌ Error profiling server: {e}"
+        
+    finally:
+        _profile_capture = None
+
+class _ChangeHandler(FileSystemEventHandler):
+    """Forward watchdog events for one directory to the watcher on the event loop."""
+    
+    KINDS = {'created': 'added', 'modified': 'modified', 'deleted': 'deleted'}
+    
+    def __init__(self, watcher, directory, loop):
+        self.watcher = watcher
+        self.directory = directory
+        self.loop = loop
+    
+    def on_any_event(self, event):
+        # Runs on watchdog's thread - only the event loop may touch the watcher
+        if event.event_type == 'moved':
+            events = [(event.src_path, 'deleted'), (event.dest_path, 'added')]
+        elif event.event_type in self.KINDS:
+            events = [(event.src_path, self.KINDS[event.event_type])]
+        else:
+            return  # opened / closed events carry no change
+        
+        changes = {
+            os.path.basename(path): kind for path, kind in events
+            if os.path.dirname(path) == self.directory
+        }
+        if changes:
+            try:
+                self.loop.call_soon_threadsafe(self.watcher._record, self.directory, changes)
+            except RuntimeError:
+                pass  # Event loop already closed - server is shutting down
+
+class DirectoryWatcher:
+    """
+    One shared watcher for every directory that clients are waiting on.
+    
+    When watchdog is installed the operating system reports changes (inotify,
+    ReadDirectoryChangesW, FSEvents), so a waiting client costs nothing until
+    something happens. Otherwise each watched directory is scanned and diffed,
+    less often the bigger it is. Either way changes are collected until a burst
+    has settled, then one batch is pushed to every subscriber queue.
+    """
+    
+    def __init__(self, use_native=None, min_interval=0.2, scan_share=0.05, debounce=0.05, max_delay=1.0):
+        self.use_native = Observer is not None if use_native is None else use_native
+        self.min_interval = min_interval  # Shortest time between scans when polling
+        self.scan_share = scan_share      # Polling: fraction of one core spent scanning a directory
+        self.debounce = debounce          # Quiet time before a burst of changes is delivered
+        self.max_delay = max_delay        # Deliver anyway if a burst keeps going this long
+        self._watches = {}
+        self._observer = None
+        self._poll_task = None
+    
+    @staticmethod
+    def _scan(directory):
+        """Return {name: (is_dir, size, mtime_ns)} for one directory."""
+        entries = {}
+        with os.scandir(directory) as it:
+            for entry in it:
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue  # Entry vanished between listing and stat
+                entries[entry.name] = (entry.is_dir(), stat.st_size, stat.st_mtime_ns)
+        return entries
+    
+    async def subscribe(self, directory):
+        """Start receiving change batches for a directory; returns the queue to read from."""
+        directory = os.path.abspath(directory)
+        queue = asyncio.Queue()
+        
+        watch = self._watches.get(directory)
+        if watch is not None:
+            watch['subscribers'].add(queue)
+            if watch['ready'] is not None:
+                # Another subscriber is still taking the first scan - share its outcome
+                try:
+                    await asyncio.shield(watch['ready'])
+                except BaseException:
+                    watch['subscribers'].discard(queue)
+                    raise
+            return queue
+        
+        watch = self._watches[directory] = {
+            'subscribers': {queue},
+            'pending': {},
+            'first_change': None,
+            'last_change': None,
+            'flush': None,          # Timer handle for the next delivery
+            'native': None,         # watchdog watch handle, or None when polling
+            'snapshot': None,       # Last scan result when polling
+            'next_scan': float('inf'),
+            'ready': None,          # Polling: future for the first scan, None once it is done
+        }
+        
+        if self.use_native:
+            try:
+                if self._observer is None:
+                    self._observer = Observer()
+                    self._observer.daemon = True
+                    self._observer.start()
+                handler = _ChangeHandler(self, directory, asyncio.get_running_loop())
+                watch['native'] = self._observer.schedule(handler, directory, recursive=False)
+                return queue
+            except OSError:
+                pass  # e.g. out of inotify watches - poll this directory instead
+        
+        ready = watch['ready'] = asyncio.get_running_loop().create_future()
+        try:
+            started = time.perf_counter()
+            watch['snapshot'] = await asyncio.to_thread(self._scan, directory)
+            self._schedule_scan(watch, time.perf_counter() - started)
+        except BaseException as e:
+            # Fail every subscriber that joined during the scan and drop the watch,
+            # so nobody is left waiting on a directory that is never scanned
+            if self._watches.get(directory) is watch:
+                del self._watches[directory]
+            error = e if isinstance(e, Exception) else OSError(f"Watching {directory} was cancelled")
+            ready.set_exception(error)
+            ready.exception()  # Mark as retrieved - later subscribers may not exist
+            raise
+        watch['ready'] = None
+        ready.set_result(None)
+        
+        if self._poll_task is None or self._poll_task.done():
+            self._poll_task = asyncio.create_task(self._poll())
+        return queue
+    
+    def unsubscribe(self, directory, queue):
+        """Stop delivering changes to a queue; the directory is dropped once unused."""
+        directory = os.path.abspath(directory)
+        watch = self._watches.get(directory)
+        if watch is None:
+            return
+        watch['subscribers'].discard(queue)
+        if watch['subscribers']:
+            return
+        
+        del self._watches[directory]
+        if watch['flush'] is not None:
+            watch['flush'].cancel()
+        if watch['native'] is not None:
+            self._observer.unschedule(watch['native'])
+    
+    def _schedule_scan(self, watch, scan_seconds):
+        """Polling: big directories take longer to scan, so scan them less often."""
+        interval = max(self.min_interval, scan_seconds / self.scan_share)
+        watch['next_scan'] = time.monotonic() + interval
+    
+    async def _poll(self):
+        """Background loop for directories without native change events."""
+        while True:
+            polled = [w for w in self._watches.values() if w['native'] is None]
+            if not polled:
+                return
+            next_scan = min(w['next_scan'] for w in polled)
+            if next_scan == float('inf'):
+                next_scan = time.monotonic() + self.min_interval  # First scan still running
+            await asyncio.sleep(max(next_scan - time.monotonic(), 0))
+            
+            for directory, watch in list(self._watches.items()):
+                if watch['native'] is not None or watch['next_scan'] > time.monotonic():
+                    continue
+                started = time.perf_counter()
+                try:
+                    current = await asyncio.to_thread(self._scan, directory)
+                except OSError:
+                    current = {}  # Directory removed or unreadable - report everything as deleted
+                
+                if self._watches.get(directory) is not watch:
+                    continue  # Last subscriber left while we were scanning
+                
+                changes = self._diff(watch['snapshot'], current)
+                watch['snapshot'] = current
+                self._schedule_scan(watch, time.perf_counter() - started)
+                if changes:
+                    self._record(directory, changes)
+    
+    @staticmethod
+    def _diff(old, new):
+        """Compare two scans and return {name: 'added' | 'modified' | 'deleted'}."""
+        changes = {}
+        for name, info in new.items():
+            if name not in old:
+                changes[name] = 'added'
+            elif old[name] != info:
+                changes[name] = 'modified'
+        for name in old:
+            if name not in new:
+                changes[name] = 'deleted'
+        return changes
+    
+    def _record(self, directory, changes):
+        """Merge new changes into the directory's pending batch and arm the delivery timer."""
+        watch = self._watches.get(directory)
+        if watch is None:
+            return
+        
+        # Coalesce: a later change to the same name replaces the earlier one,
+        # except that "added then modified" is still reported as added,
+        # "added then deleted" cancels out and "deleted then added" is a modification
+        pending = watch['pending']
+        for name, kind in changes.items():
+            previous = pending.get(name)
+            if previous == 'added' and kind == 'modified':
+                continue
+            if previous == 'added' and kind == 'deleted':
+                del pending[name]
+            elif previous == 'deleted' and kind == 'added':
+                pending[name] = 'modified'
+            else:
+                pending[name] = kind
+        
+        now = time.monotonic()
+        if watch['first_change'] is None:
+            watch['first_change'] = now
+        watch['last_change'] = now
+        if watch['flush'] is None:
+            watch['flush'] = asyncio.get_running_loop().call_later(self.debounce, self._flush, directory)
+    
+    def _flush(self, directory):
+        """Deliver the pending batch once the burst has gone quiet (or max_delay has passed)."""
+        watch = self._watches.get(directory)
+        if watch is None:
+            return
+        watch['flush'] = None
+        
+        if not watch['pending']:
+            watch['first_change'] = None
+            return
+        
+        now = time.monotonic()
+        quiet_for = now - watch['last_change']
+        waiting_for = now - watch['first_change']
+        if quiet_for < self.debounce and waiting_for < self.max_delay:
+            delay = min(self.debounce - quiet_for, self.max_delay - waiting_for)
+            watch['flush'] = asyncio.get_running_loop().call_later(delay, self._flush, directory)
+            return
+        
+        batch = sorted(watch['pending'].items())
+        watch['pending'] = {}
+        watch['first_change'] = None
+        for queue in list(watch['subscribers']):
+            queue.put_nowait(batch)
+
+# Shared by all sessions connected to this server process
+directory_watcher = DirectoryWatcher()
+
+def _changed_since(directory, pattern, since, include_hidden):
+    """Names in a directory matching pattern that were modified at or after since."""
+    matches = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            if not include_hidden and entry.name.startswith('.'):
+                continue
+            if not fnmatch.fnmatch(entry.name, pattern):
+                continue
+            try:
+                if entry.stat().st_mtime >= since:
+                    matches.append(entry.name)
+            except OSError:
+                continue  # Entry vanished between listing and stat
+    return sorted(matches)
+
+@mcp.tool()
+async def wait_for_changes(directory_path: str, pattern: str = "*", timeout: float = 60.0,
+                           include_hidden: bool = False, since: float | None = None) -> str:
+    """
+    Wait until files in a directory are added, modified or deleted
+    
+    Use this instead of calling a listing tool in a loop - the call simply
+    returns as soon as a matching change happens.
+    
+    Args:
+        directory_path: Path to the directory to watch
+        pattern: Only report names matching this glob pattern (e.g. "*.whl")
+        timeout: Maximum number of seconds to wait
+        include_hidden: Whether to report hidden files (starting with .)
+        since: Return at once if a matching entry was already modified at or after
+            this time (seconds since the epoch, e.g. when the build started).
+            Use 0 to return at once if any matching entry exists.
+        
+    Returns:
+        The list of changes, or a message saying nothing changed before the timeout
+    """
+    path = Path(directory_path)
+    
+    if not path.exists():
+        return f"❌ Directory not found: {directory_path}"
+    
+    if not path.is_dir():
+        return f"❌ Not a directory: {directory_path}"
+    
+    if timeout <= 0:
+        return f"❌ timeout must be positive: {timeout}"
+    
+    try:
+        queue = await directory_watcher.subscribe(directory_path)
+    except PermissionError:
+        return f"❌ Permission denied: {directory_path}"
+    except Exception as e:
+        return f"❌ Error watching directory: {e}"
+    
+    try:
+        # Check existing entries only after subscribing, so a change that lands
+        # in between is caught by one or the other
+        if since is not None:
+            existing = await asyncio.to_thread(_changed_since, directory_path, pattern, since, include_hidden)
+            if existing:
+                result = f"Already changed in {directory_path}:\n"
+                for name in existing:
+                    result += f"[CHANGED] {name}\n"
+                return result
+        
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return f"No changes in {directory_path} matching '{pattern}' within {timeout:g}s"
+            
+            try:
+                batch = await asyncio.wait_for(queue.get(), timeout=remaining)
+            except asyncio.TimeoutError:
+                continue
+            
+            matches = [
+                (name, kind) for name, kind in batch
+                if fnmatch.fnmatch(name, pattern)
+                and (include_hidden or not name.startswith('.'))
+            ]
+            if not matches:
+                continue
+            
+            result = f"Changes in {directory_path}:\n"
+            for name, kind in matches:
+                result += f"[{kind.upper()}] {name}\n"
+            return result
+    
+    except PermissionError:
+        return f"❌ Permission denied: {directory_path}"
+    
+    except Exception as e:
+        return f"❌ Error watching directory: {e}"
+    
+    finally:
+        directory_watcher.unsubscribe(directory_path, queue)
+
+# Upper limit on how many paths one stat_paths call may ask for
+MAX_STAT_PATHS = 20000
+
+def _split_path(path):
+    """
+    Split a path into (parent directory, name) without normalizing it.
+    
+    A trailing separator stays on the name, so "file.txt/" still fails the
+    way the operating system would fail it instead of matching the file.
+    """
+    trimmed = path.rstrip('/' + os.sep)
+    parent, name = os.path.split(trimmed)
+    if not name:
+        return path, os.curdir  # Filesystem root (or drive) - stat it as "." inside itself
+    if trimmed != path:
+        name += os.sep
+    return parent or os.curdir, name
+
+def _stat_directory_group(parent, names):
+    """
+    Stat several names that share one parent directory.
+    
+    On platforms that support it the parent is opened once and every name is
+    looked up relative to it, so the parent path is only resolved one time.
+    
+    Returns {name: (kind, size, mtime) or error message}
+    """
+    results = {}
+    dir_fd = None
+    if os.stat in os.supports_dir_fd:
+        try:
+            # O_DIRECTORY makes this fail at once instead of opening a FIFO
+            # (which would block forever) or a device file
+            dir_fd = os.open(parent, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+        except FileNotFoundError:
+            return {name: ('missing', None, None) for name in names}
+        except NotADirectoryError:
+            return {name: "Not a directory" for name in names}
+        except (OSError, ValueError):
+            dir_fd = None  # Fall back to full paths below, which report the error per name
+    
+    try:
+        for name in names:
+            try:
+                if dir_fd is not None:
+                    st = os.stat(name, dir_fd=dir_fd)
+                else:
+                    st = os.stat(os.path.join(parent, name))
+            except FileNotFoundError:
+                results[name] = ('missing', None, None)
+                continue
+            except NotADirectoryError:
+                results[name] = "Not a directory"
+                continue
+            except PermissionError:
+                results[name] = "Permission denied"
+                continue
+            except (OSError, ValueError) as e:
+                results[name] = str(e)  # e.g. "embedded null byte"
+                continue
+            
+            if stat_module.S_ISREG(st.st_mode):
+                kind, size = 'file', st.st_size
+            elif stat_module.S_ISDIR(st.st_mode):
+                kind, size = 'directory', None
+            else:
+                kind, size = 'other', None  # FIFO, socket, device...
+            results[name] = (kind, size, datetime.datetime.fromtimestamp(st.st_mtime).isoformat())
+    finally:
+        if dir_fd is not None:
+            os.close(dir_fd)
+    
+    return results
+
+@mcp.tool()
+async def stat_paths(paths: list[str]) -> str:
+    """
+    Look up size, modification time and existence for many paths at once
+    
+    Much cheaper than listing every parent directory when you already know
+    which files you care about (e.g. paths from a diff or a build log).
+    
+    Args:
+        paths: The file or directory paths to look up
+        
+    Returns:
+        JSON object with one column per field ("path", "type", "size", "modified"),
+        where type is "file", "directory", "other" (FIFO, socket, device) or "missing", plus an "errors" object
+        mapping a path to its error message for paths that could not be checked
+    """
+    if len(paths) > MAX_STAT_PATHS:
+        return f"❌ Too many paths: {len(paths):,} (limit is {MAX_STAT_PATHS:,})"
+    
+    try:
+        # Group by parent directory so each directory is resolved only once
+        locations = {}
+        groups = {}
+        for raw_path in paths:
+            if raw_path in locations or not raw_path:
+                continue
+            parent, name = locations[raw_path] = _split_path(raw_path)
+            groups.setdefault(parent, []).append(name)
+        
+        def stat_all():
+            return {parent: _stat_directory_group(parent, names) for parent, names in groups.items()}
+        group_results = await asyncio.to_thread(stat_all)
+        
+        columns = {'path': [], 'type': [], 'size': [], 'modified': []}
+        errors = {}
+        for raw_path in paths:
+            if raw_path:
+                parent, name = locations[raw_path]
+                info = group_results[parent][name]
+            else:
+                info = "Empty path"
+            
+            columns['path'].append(raw_path)
+            if isinstance(info, str):
+                errors[raw_path] = info
+                info = (None, None, None)
+            columns['type'].append(info[0])
+            columns['size'].append(info[1])
+            columns['modified'].append(info[2])
+        
+        columns['errors'] = errors
+        return json.dumps(columns, separators=(',', ':'))
+        
+    except Exception as e:
+        return f"❌ Error checking paths: {e}"
+
+def _scan_tree_columns(root, include_hidden=False, max_depth=None):
+    """
+    Walk a directory tree and collect file metadata as parallel columns.
+    
+    Values are gathered in plain lists while walking and converted to NumPy
+    arrays once at the end. Only regular files are counted; symlinks are
+    neither followed nor counted.
+    
+    Returns (sizes, mtimes, depths, extension_ids, extension_names, errors) where
+    the first four are NumPy arrays with one element per file.
+    """
+    sizes, mtimes, extension_ids = [], [], []
+    directory_depths, directory_counts = [], []   # Depth is stored once per directory
+    extension_lookup = {}   # Lower-case extension -> id
+    suffix_ids = {}         # Extension exactly as written -> id (skips .lower() for repeats)
+    errors = 0
+    
+    stack = [(root, 0)]
+    while stack:
+        directory, depth = stack.pop()
+        files_before = len(sizes)
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    name = entry.name
+                    if not include_hidden and name.startswith('.'):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if max_depth is None or depth < max_depth:
+                                stack.append((entry.path, depth + 1))
+                            continue
+                        # Symlinks (including broken ones), sockets, devices etc. are not counted
+                        if not entry.is_file(follow_symlinks=False):
+                            continue
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        errors += 1
+                        continue
+                    
+                    # Same result as os.path.splitext(name)[1], without its overhead
+                    dot = name.rfind('.')
+                    suffix = name[dot:] if dot > 0 and name[:dot].lstrip('.') else ''
+                    extension_id = suffix_ids.get(suffix)
+                    if extension_id is None:
+                        extension_id = extension_lookup.setdefault(suffix.lower(), len(extension_lookup))
+                        suffix_ids[suffix] = extension_id
+                    
+                    sizes.append(st.st_size)
+                    mtimes.append(st.st_mtime)
+                    extension_ids.append(extension_id)
+        except OSError:
+            errors += 1
+        
+        if len(sizes) > files_before:
+            directory_depths.append(depth)
+            directory_counts.append(len(sizes) - files_before)
+    
+    return (
+        np.array(sizes, dtype=np.int64),
+        np.array(mtimes, dtype=np.float64),
+        np.repeat(np.array(directory_depths, dtype=np.int32), directory_counts),
+        np.array(extension_ids, dtype=np.int32),
+        list(extension_lookup),
+        errors,
+    )
+
+def _summarize_columns(sizes, mtimes, depths, extension_ids, extension_names,
+                       now=None, older_than_days=None, min_size=0, top=10):
+    """
+    Compute the analyze_files report from metadata columns with vectorized NumPy operations.
+    
+    Returns a dict of aggregates (no per-file data).
+    """
+    now = time.time() if now is None else now
+    
+    # Filters combine into one boolean mask
+    mask = sizes >= min_size
+    if older_than_days is not None:
+        mask &= mtimes < now - older_than_days * 86400
+    
+    sizes, mtimes, depths, extension_ids = sizes[mask], mtimes[mask], depths[mask], extension_ids[mask]
+    summary = {'count': int(sizes.size), 'total_size': int(sizes.sum())}
+    if sizes.size == 0:
+        return summary
+    
+    percentiles = np.percentile(sizes, [50, 90, 99])
+    summary['size_percentiles'] = {
+        'p50': int(percentiles[0]), 'p90': int(percentiles[1]), 'p99': int(percentiles[2]),
+        'max': int(sizes.max()),
+    }
+    
+    # Group by extension: file count and total bytes per extension id
+    counts = np.bincount(extension_ids, minlength=len(extension_names))
+    totals = np.bincount(extension_ids, weights=sizes, minlength=len(extension_names))
+    # Drop extensions the filters removed before ranking, so they can't take
+    # the top slots from extensions whose files are all empty
+    present = np.flatnonzero(counts)
+    order = present[np.argsort(totals[present], kind='stable')[::-1]][:top]
+    summary['by_extension'] = [
+        (extension_names[i] or '(none)', int(counts[i]), int(totals[i]))
+        for i in order
+    ]
+    
+    # Size histogram in power-of-two buckets: bucket b holds sizes below 2**b bytes
+    buckets = np.bincount(np.ceil(np.log2(sizes + 1)).astype(np.int64))
+    summary['size_histogram'] = [(int(b), int(c)) for b, c in enumerate(buckets) if c]
+    
+    # Age histogram in days
+    age_days = (now - mtimes) / 86400
+    edges = np.array([0, 1, 7, 30, 90, 365, np.inf])
+    age_counts, _ = np.histogram(np.clip(age_days, 0, None), bins=edges)
+    summary['age_histogram'] = [
+        (f"{int(edges[i])}d+" if np.isinf(edges[i + 1]) else f"{int(edges[i])}-{int(edges[i + 1])}d", int(c))
+        for i, c in enumerate(age_counts)
+    ]
+    
+    summary['depth_counts'] = [(d, int(c)) for d, c in enumerate(np.bincount(depths)) if c]
+    return summary
+
+@mcp.tool()
+async def analyze_files(directory_path: str, older_than_days: float | None = None, min_size: int = 0,
+                        include_hidden: bool = False, max_depth: int | None = None, top: int = 10) -> str:
+    """
+    Summarize the files under a directory tree (sizes, extensions, ages, depths)
+    
+    Only aggregates are returned, so this works on very large trees where a
+    full listing would be far too long.
+    
+    Args:
+        directory_path: Root of the tree to analyze
+        older_than_days: Only include files not modified for this many days
+        min_size: Only include files of at least this many bytes
+        include_hidden: Whether to include hidden files and directories (starting with .)
+        max_depth: How many directory levels to descend (None = unlimited)
+        top: How many extensions to show, largest total size first
+        
+    Returns:
+        Report with totals, size percentiles, per-extension totals and size/age/depth histograms
+    """
+    if np is None:
+        return "❌ analyze_files needs NumPy. Install it with: pip install numpy"
+    
+    path = Path(directory_path)
+    
+    if not path.exists():
+        return f"❌ Directory not found: {directory_path}"
+    
+    if not path.is_dir():
+        return f"❌ Not a directory: {directory_path}"
+    
+    try:
+        sizes, mtimes, depths, extension_ids, extension_names, errors = await asyncio.to_thread(
+            _scan_tree_columns, directory_path, include_hidden, max_depth)
+        summary = _summarize_columns(sizes, mtimes, depths, extension_ids, extension_names,
+                                     older_than_days=older_than_days, min_size=min_size, top=top)
+        
+        result = f"Analysis of {directory_path}\n"
+        filters = []
+        if older_than_days is not None:
+            filters.append(f"older than {older_than_days:g} days")
+        if min_size:
+            filters.append(f"at least {min_size:,} bytes")
+        if filters:
+            result += f"Filter: {', '.join(filters)}\n"
+        result += f"Files: {summary['count']:,} ({summary['total_size']:,} bytes)"
+        result += f" of {sizes.size:,} scanned\n"
+        if errors:
+            result += f"Skipped {errors:,} unreadable entries\n"
+        
+        if summary['count'] == 0:
+            return result
+        
+        p = summary['size_percentiles']
+        result += f"\nSize percentiles: p50 {p['p50']:,}  p90 {p['p90']:,}  p99 {p['p99']:,}  max {p['max']:,}\n"
+        
+        result += f"\n{'Extension':<12} {'Files':>10} {'Bytes':>16}\n"
+        for extension, count, total in summary['by_extension']:
+            result += f"{extension:<12} {count:>10,} {total:>16,}\n"
+        
+        result += "\nSize histogram (files below N bytes):\n"
+        for bucket, count in summary['size_histogram']:
+            result += f"  < {2 ** bucket:>14,} {count:>10,}\n"
+        
+        result += "\nAge histogram (days since modified):\n"
+        for label, count in summary['age_histogram']:
+            result += f"  {label:<10} {count:>10,}\n"
+        
+        result += "\nFiles per depth:\n"
+        for depth, count in summary['depth_counts']:
+            result += f"  {depth:<4} {count:>10,}\n"
+        
+        return result
+        
+    except PermissionError:
+        return f"❌ Permission denied: {directory_path}"
+        
+    except Exception as e:
+        return f"❌ Error analyzing directory: {e}"
+
 # Main entry point - runs the server using stdio transport
 if __name__ == "__main__":
     mcp.run(transport='stdio')
\ No newline at end of file
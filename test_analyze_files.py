@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Tests for the analyze_files tool and its NumPy helpers.
+
+Run with:  python -m pytest test_analyze_files.py
+"""
+
+import asyncio
+import os
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from simple_mcp_server import _scan_tree_columns, _summarize_columns, analyze_files
+
+
+def test_scan_counts_only_regular_files(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "a.TXT").write_text("hello")
+    (tmp_path / "b").write_text("xy")
+    (tmp_path / ".hidden").write_text("x")
+    os.symlink("sub", tmp_path / "linkdir")
+    os.symlink("nowhere", tmp_path / "broken")
+
+    sizes, mtimes, depths, extension_ids, names, errors = _scan_tree_columns(str(tmp_path))
+    found = sorted(zip(sizes.tolist(), depths.tolist(), [names[i] for i in extension_ids]))
+    assert found == [(2, 0, ''), (5, 1, '.txt')]
+    assert errors == 0
+
+
+def test_filtered_out_extensions_do_not_take_top_slots():
+    now = time.time()
+    old = now - 10 * 86400
+    # Three old empty .txt files and one recent .log file
+    sizes = np.array([0, 0, 0, 10])
+    mtimes = np.array([old, old, old, now])
+    depths = np.zeros(4, dtype=np.int32)
+    extension_ids = np.array([0, 0, 0, 1], dtype=np.int32)
+
+    summary = _summarize_columns(sizes, mtimes, depths, extension_ids, ['.txt', '.log'],
+                                 now=now, older_than_days=1, top=1)
+    assert summary['count'] == 3
+    assert summary['by_extension'] == [('.txt', 3, 0)]
+
+
+def test_summary_groups_and_histograms():
+    now = time.time()
+    sizes = np.array([1, 3, 100, 1000])
+    mtimes = np.array([now, now - 2 * 86400, now - 40 * 86400, now - 400 * 86400])
+    depths = np.array([0, 0, 1, 2], dtype=np.int32)
+    extension_ids = np.array([0, 1, 1, 0], dtype=np.int32)
+
+    summary = _summarize_columns(sizes, mtimes, depths, extension_ids, ['.py', ''], now=now)
+    assert summary['count'] == 4
+    assert summary['total_size'] == 1104
+    assert summary['by_extension'] == [('.py', 2, 1001), ('(none)', 2, 103)]
+    assert summary['size_histogram'] == [(1, 1), (2, 1), (7, 1), (10, 1)]
+    assert [count for _, count in summary['age_histogram']] == [1, 1, 0, 1, 0, 1]
+    assert summary['depth_counts'] == [(0, 2), (1, 1), (2, 1)]
+
+
+def test_analyze_files_reports_missing_directory(tmp_path):
+    result = asyncio.run(analyze_files(str(tmp_path / "nope")))
+    assert result.startswith("❌ Directory not found")
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared directory watcher behind wait_for_changes.
+
+Run with:  python -m pytest test_directory_watcher.py
+"""
+
+import asyncio
+import os
+import time
+
+import pytest
+
+import simple_mcp_server
+from simple_mcp_server import DirectoryWatcher, Observer, wait_for_changes
+
+
+async def next_batch(queue, timeout=2.0):
+    return await asyncio.wait_for(queue.get(), timeout=timeout)
+
+
+def test_added_then_modified_is_reported_as_added(tmp_path):
+    async def run():
+        watcher = DirectoryWatcher(use_native=False, debounce=0.05)
+        queue = await watcher.subscribe(str(tmp_path))
+        watcher._record(os.path.abspath(tmp_path), {'a.txt': 'added'})
+        watcher._record(os.path.abspath(tmp_path), {'a.txt': 'modified'})
+        assert await next_batch(queue) == [('a.txt', 'added')]
+        watcher.unsubscribe(str(tmp_path), queue)
+    asyncio.run(run())
+
+
+def test_added_then_deleted_cancels_out(tmp_path):
+    async def run():
+        watcher = DirectoryWatcher(use_native=False, debounce=0.05)
+        queue = await watcher.subscribe(str(tmp_path))
+        directory = os.path.abspath(tmp_path)
+        watcher._record(directory, {'tmp.txt': 'added', 'keep.txt': 'added'})
+        watcher._record(directory, {'tmp.txt': 'deleted'})
+        assert await next_batch(queue) == [('keep.txt', 'added')]
+        watcher.unsubscribe(str(tmp_path), queue)
+    asyncio.run(run())
+
+
+def test_deleted_then_added_is_reported_as_modified(tmp_path):
+    async def run():
+        watcher = DirectoryWatcher(use_native=False, debounce=0.05)
+        queue = await watcher.subscribe(str(tmp_path))
+        directory = os.path.abspath(tmp_path)
+        watcher._record(directory, {'out.whl': 'deleted'})
+        watcher._record(directory, {'out.whl': 'added'})
+        assert await next_batch(queue) == [('out.whl', 'modified')]
+        watcher.unsubscribe(str(tmp_path), queue)
+    asyncio.run(run())
+
+
+def test_burst_is_debounced_into_one_batch(tmp_path):
+    async def run():
+        watcher = DirectoryWatcher(use_native=False, debounce=0.1, max_delay=5.0)
+        queue = await watcher.subscribe(str(tmp_path))
+        directory = os.path.abspath(tmp_path)
+        for i in range(5):
+            watcher._record(directory, {f"f{i}": 'added'})
+            await asyncio.sleep(0.03)  # Shorter than debounce - burst keeps going
+        batch = await next_batch(queue)
+        assert batch == [(f"f{i}", 'added') for i in range(5)]
+        assert queue.empty()
+        watcher.unsubscribe(str(tmp_path), queue)
+    asyncio.run(run())
+
+
+def test_long_burst_is_delivered_after_max_delay(tmp_path):
+    async def run():
+        watcher = DirectoryWatcher(use_native=False, debounce=0.1, max_delay=0.2)
+        queue = await watcher.subscribe(str(tmp_path))
+        directory = os.path.abspath(tmp_path)
+        started = time.monotonic()
+        for i in range(20):
+            watcher._record(directory, {f"f{i}": 'added'})
+            await asyncio.sleep(0.03)
+            if not queue.empty():
+                break
+        assert not queue.empty(), "batch should arrive while the burst is still going"
+        assert time.monotonic() - started < 0.5
+        watcher.unsubscribe(str(tmp_path), queue)
+    asyncio.run(run())
+
+
+def test_every_subscriber_gets_the_batch(tmp_path):
+    async def run():
+        watcher = DirectoryWatcher(use_native=False, debounce=0.05)
+        first = await watcher.subscribe(str(tmp_path))
+        second = await watcher.subscribe(str(tmp_path))
+        watcher._record(os.path.abspath(tmp_path), {'a': 'added'})
+        assert await next_batch(first) == await next_batch(second) == [('a', 'added')]
+        watcher.unsubscribe(str(tmp_path), first)
+        watcher.unsubscribe(str(tmp_path), second)
+        assert watcher._watches == {}
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("use_native", [
+    False,
+    pytest.param(True, marks=pytest.mark.skipif(Observer is None, reason="watchdog not installed")),
+])
+def test_wait_for_changes_sees_new_file(tmp_path, monkeypatch, use_native):
+    monkeypatch.setattr(simple_mcp_server, "directory_watcher",
+                        DirectoryWatcher(use_native=use_native, debounce=0.05))
+
+    async def run():
+        async def build():
+            await asyncio.sleep(0.3)
+            (tmp_path / "notes.txt").write_text("x")
+            (tmp_path / "app.whl").write_text("x")
+        writer = asyncio.create_task(build())
+        result = await wait_for_changes(str(tmp_path), pattern="*.whl", timeout=5)
+        await writer
+        return result
+    assert asyncio.run(run()) == f"Changes in {tmp_path}:\n[ADDED] app.whl\n"
+
+
+def test_wait_for_changes_since_returns_existing_match(tmp_path):
+    started = time.time() - 1
+    (tmp_path / "app.whl").write_text("x")
+
+    async def run():
+        return await wait_for_changes(str(tmp_path), pattern="*.whl", timeout=5, since=started)
+    assert asyncio.run(run()) == f"Already changed in {tmp_path}:\n[CHANGED] app.whl\n"
+
+
+def test_wait_for_changes_since_ignores_older_files(tmp_path):
+    old = tmp_path / "app.whl"
+    old.write_text("x")
+    os.utime(old, (1_000_000, 1_000_000))
+
+    async def run():
+        return await wait_for_changes(str(tmp_path), pattern="*.whl", timeout=0.3, since=time.time() - 60)
+    assert asyncio.run(run()).startswith("No changes")
+
+
+def test_failed_first_scan_fails_every_subscriber(tmp_path):
+    async def run():
+        watcher = DirectoryWatcher(use_native=False)
+
+        def failing_scan(directory):
+            time.sleep(0.1)  # Long enough for the second subscriber to join
+            raise PermissionError("Permission denied")
+        watcher._scan = failing_scan
+
+        results = await asyncio.gather(
+            watcher.subscribe(str(tmp_path)),
+            watcher.subscribe(str(tmp_path)),
+            return_exceptions=True,
+        )
+        assert all(isinstance(r, PermissionError) for r in results)
+        assert watcher._watches == {}
+    asyncio.run(run())
+
+
+def test_subscriber_joining_during_first_scan_gets_changes(tmp_path):
+    async def run():
+        watcher = DirectoryWatcher(use_native=False, min_interval=0.05, scan_share=1.0, debounce=0.05)
+        real_scan = watcher._scan
+
+        def slow_scan(directory):
+            time.sleep(0.1)
+            return real_scan(directory)
+        watcher._scan = slow_scan
+
+        first, second = await asyncio.gather(
+            watcher.subscribe(str(tmp_path)),
+            watcher.subscribe(str(tmp_path)),
+        )
+        (tmp_path / "a.txt").write_text("x")
+        assert await next_batch(first) == await next_batch(second) == [('a.txt', 'added')]
+        watcher.unsubscribe(str(tmp_path), first)
+        watcher.unsubscribe(str(tmp_path), second)
+    asyncio.run(run())
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tests for the stat_paths tool.
+
+Run with:  python -m pytest test_stat_paths.py
+"""
+
+import asyncio
+import json
+import os
+
+import pytest
+
+from simple_mcp_server import _split_path, stat_paths
+
+
+def run_stat_paths(paths):
+    return json.loads(asyncio.run(stat_paths(paths)))
+
+
+def test_split_path_keeps_trailing_separator():
+    assert _split_path("/etc/passwd/") == ("/etc", "passwd" + os.sep)
+    assert _split_path("/etc/passwd") == ("/etc", "passwd")
+
+
+def test_split_path_relative_and_root():
+    assert _split_path("README.md") == (os.curdir, "README.md")
+    assert _split_path("/") == ("/", os.curdir)
+
+
+def test_files_directories_and_root(tmp_path):
+    (tmp_path / "a.txt").write_text("hello")
+    (tmp_path / "sub").mkdir()
+    result = run_stat_paths([str(tmp_path / "a.txt"), str(tmp_path / "sub"), "/"])
+    assert result['type'] == ['file', 'directory', 'directory']
+    assert result['size'] == [5, None, None]
+    assert all(result['modified'])
+    assert result['errors'] == {}
+
+
+def test_trailing_slash_on_a_file_is_an_error(tmp_path):
+    (tmp_path / "a.txt").write_text("hello")
+    path = str(tmp_path / "a.txt") + "/"
+    result = run_stat_paths([path])
+    assert result['type'] == [None]
+    assert result['errors'] == {path: "Not a directory"}
+
+
+def test_empty_path_is_an_error(tmp_path):
+    result = run_stat_paths(["", str(tmp_path)])
+    assert result['type'] == [None, 'directory']
+    assert result['errors'] == {"": "Empty path"}
+
+
+def test_nul_byte_only_fails_that_path(tmp_path):
+    (tmp_path / "a.txt").write_text("hello")
+    bad = str(tmp_path / "a\0b")
+    result = run_stat_paths([bad, str(tmp_path / "a.txt")])
+    assert result['type'] == [None, 'file']
+    assert result['errors'] == {bad: "embedded null byte"}
+
+
+def test_missing_file_and_missing_parent(tmp_path):
+    paths = [str(tmp_path / "nope.txt"), str(tmp_path / "no_dir" / "x.txt")]
+    result = run_stat_paths(paths)
+    assert result['type'] == ['missing', 'missing']
+    assert result['errors'] == {}
+
+
+def test_duplicate_paths_keep_their_positions(tmp_path):
+    (tmp_path / "a.txt").write_text("hello")
+    path = str(tmp_path / "a.txt")
+    result = run_stat_paths([path, str(tmp_path / "nope"), path])
+    assert result['path'] == [path, str(tmp_path / "nope"), path]
+    assert result['type'] == ['file', 'missing', 'file']
+    assert result['size'] == [5, None, 5]
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="needs FIFOs")
+def test_fifo_is_other_and_fifo_parent_does_not_block(tmp_path):
+    fifo = tmp_path / "fifo"
+    os.mkfifo(fifo)
+    child = str(fifo / "x")
+    result = run_stat_paths([str(fifo), child])
+    assert result['type'] == ['other', None]
+    assert result['size'] == [None, None]
+    assert result['errors'] == {child: "Not a directory"}